@@ -10,13 +10,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy import select, func
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
-from .database import engine, get_db
-from .models import Event, init_db
-from .schemas import EventMeta, EventListResponse, EventResponseItem
+from .database import get_db, get_engine
+from .models import Event, bbox_intersects, init_db
+from .responses import json_response
+from .schemas import EventMeta, EventListResponse
 from .security import verify_api_key
 from .settings import settings
 from .storage_service import (
@@ -35,13 +33,25 @@ logging.basicConfig(level=logging.INFO)
 
 app = FastAPI(title='Buurt Tracking API')
 
-limiter = Limiter(key_func=get_remote_address, default_limits=['120/minute'])
-app.state.limiter = limiter
 
+class _NoopLimiter:
+    def limit(self, *args, **kwargs):
+        return lambda func: func
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request, exc):
-    return JSONResponse(status_code=429, content={'detail': 'Rate limit exceeded'})
+
+if settings.enable_rate_limit:
+    from slowapi import Limiter
+    from slowapi.errors import RateLimitExceeded
+    from slowapi.util import get_remote_address
+
+    limiter = Limiter(key_func=get_remote_address, default_limits=['120/minute'])
+    app.state.limiter = limiter
+
+    @app.exception_handler(RateLimitExceeded)
+    async def rate_limit_handler(request, exc):
+        return JSONResponse(status_code=429, content={'detail': 'Rate limit exceeded'})
+else:
+    limiter = _NoopLimiter()
 
 
 if settings.cors_origins:
@@ -57,7 +67,8 @@ if settings.cors_origins:
 @app.on_event('startup')
 async def on_startup():
     ensure_storage()
-    init_db(engine)
+    if settings.auto_create_schema:
+        init_db(get_engine())
 
 
 @app.get('/health')
@@ -191,19 +202,49 @@ async def commit_upload(request: Request, body: dict = Body(...), _: None = Depe
     return {'status': 'committed'}
 
 
+EVENT_LIST_COLUMNS = (
+    Event.event_id,
+    Event.ts,
+    Event.company_key,
+    Event.avg_conf,
+    Event.duration_ms,
+    Event.clip_enabled,
+    Event.clip_score,
+    Event.snapshot_path,
+    Event.video_ref,
+    Event.telegram_message_id,
+)
+
+
 @app.get('/events', response_model=EventListResponse)
 async def list_events(
+    request: Request,
     limit: int = 50,
     offset: int = 0,
     from_ts: Optional[str] = None,
     to_ts: Optional[str] = None,
     company_key: Optional[str] = None,
     clip_enabled: Optional[bool] = None,
+    min_conf: Optional[float] = None,
+    min_duration_ms: Optional[int] = None,
+    region: Optional[str] = None,
     _: None = Depends(verify_api_key),
     db: Session = Depends(get_db),
 ):
     limit = min(limit, 500)
     filters = []
+    if region:
+        try:
+            x1, y1, x2, y2 = (float(part) for part in region.split(','))
+        except ValueError:
+            raise HTTPException(status_code=400, detail='region must be x1,y1,x2,y2')
+        if x2 < x1 or y2 < y1:
+            raise HTTPException(status_code=400, detail='region must have x1 <= x2 and y1 <= y2')
+        filters.extend(bbox_intersects(db.get_bind(), x1, y1, x2, y2))
+    if min_conf is not None:
+        filters.append(Event.avg_conf >= min_conf)
+    if min_duration_ms is not None:
+        filters.append(Event.duration_ms >= min_duration_ms)
     if company_key:
         filters.append(Event.company_key == company_key)
     if clip_enabled is not None:
@@ -213,29 +254,40 @@ async def list_events(
     if to_ts:
         filters.append(Event.ts <= to_ts)
     count_stmt = select(func.count()).select_from(Event)
-    query_stmt = select(Event)
+    query_stmt = select(*EVENT_LIST_COLUMNS)
     if filters:
         count_stmt = count_stmt.where(*filters)
         query_stmt = query_stmt.where(*filters)
     total = db.scalar(count_stmt)
     query = query_stmt.order_by(Event.ts.desc()).limit(limit).offset(offset)
-    rows = db.scalars(query).all()
+    rows = db.execute(query).all()
     items = [
-        EventResponseItem(
-            event_id=row.event_id,
-            ts=datetime.fromisoformat(row.ts),
-            company_key=row.company_key,
-            avg_conf=row.avg_conf,
-            duration_ms=row.duration_ms,
-            clip_enabled=bool(row.clip_enabled),
-            clip_score=row.clip_score,
-            snapshot_path=row.snapshot_path,
-            video_ref=row.video_ref,
-            telegram_message_id=row.telegram_message_id,
-        )
-        for row in rows
+        {
+            'event_id': event_id,
+            'ts': ts[:-6] + 'Z' if ts.endswith('+00:00') else ts,
+            'company_key': company,
+            'avg_conf': avg_conf,
+            'duration_ms': duration_ms,
+            'clip_enabled': bool(clip),
+            'clip_score': clip_score,
+            'snapshot_path': snapshot_path,
+            'video_ref': video_ref,
+            'telegram_message_id': telegram_message_id,
+        }
+        for (
+            event_id,
+            ts,
+            company,
+            avg_conf,
+            duration_ms,
+            clip,
+            clip_score,
+            snapshot_path,
+            video_ref,
+            telegram_message_id,
+        ) in rows
     ]
-    return EventListResponse(items=items, total=total or 0)
+    return json_response(request, {'items': items, 'total': total or 0})
 
 
 def create_media_token(path: str) -> str:
@@ -1,16 +1,25 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from .settings import settings
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={'check_same_thread': False} if settings.database_url.lower().startswith('sqlite') else {},
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@lru_cache(maxsize=1)
+def get_engine():
+    return create_engine(
+        settings.database_url,
+        connect_args={'check_same_thread': False} if settings.database_url.lower().startswith('sqlite') else {},
+    )
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker():
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
 
 
 def get_db():
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
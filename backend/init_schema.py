@@ -0,0 +1,25 @@
+"""Create missing tables and build or repair the spatial index on events.
+
+Worker startup never backfills the index, so run this once from the project
+root after upgrading an existing database, after any migration that rebuilds
+the events table, or whenever workers start with AUTO_CREATE_SCHEMA=false.
+It holds the database write lock while it runs:
+
+    python -m backend.init_schema
+"""
+import logging
+
+from .database import get_engine
+from .models import build_bbox_index, init_db
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    engine = get_engine()
+    init_db(engine)
+    build_bbox_index(engine)
+    logging.getLogger(__name__).info('Schema is up to date')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,11 @@
+import logging
 from datetime import datetime
 
-from sqlalchemy import Column, Float, Integer, String
+from sqlalchemy import Column, Float, Integer, String, bindparam, column, func, inspect, select, table, text
 from sqlalchemy.orm import declarative_base
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
 
@@ -27,5 +30,174 @@ class Event(Base):
     created_at = Column(String, nullable=False, default=lambda: datetime.utcnow().isoformat())
 
 
+# Spatial index over the bbox columns. On SQLite this is an R*Tree virtual
+# table maintained by triggers, so every write path (ingest, bulk deletes,
+# manual edits) keeps it in sync. Entries carry event_id as an auxiliary
+# column instead of reusing the events rowid, which SQLite may renumber for
+# tables without an INTEGER PRIMARY KEY. On PostgreSQL a GiST expression
+# index over box(point, point) serves the same purpose.
+BBOX_INDEX_TABLE = 'events_bbox'
+POSTGRES_BBOX_INDEX = 'ix_events_bbox_gist'
+bbox_index = table(
+    BBOX_INDEX_TABLE,
+    column('id'),
+    column('min_x'),
+    column('max_x'),
+    column('min_y'),
+    column('max_y'),
+    column('event_id'),
+)
+
+# Triggers locate the old entry through the R*Tree using the old bbox, so
+# updates and deletes are index lookups rather than scans of event_id.
+_SQLITE_OLD_BBOX_MATCH = (
+    'min_x <= old.bbox_x2 AND max_x >= old.bbox_x1 AND min_y <= old.bbox_y2 AND max_y >= old.bbox_y1 '
+    'AND event_id = old.event_id'
+)
+SQLITE_BBOX_INDEX_DDL = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {BBOX_INDEX_TABLE} USING rtree(id, min_x, max_x, min_y, max_y, +event_id)',
+    f"""CREATE TRIGGER IF NOT EXISTS {BBOX_INDEX_TABLE}_insert AFTER INSERT ON events BEGIN
+        INSERT INTO {BBOX_INDEX_TABLE} (min_x, max_x, min_y, max_y, event_id)
+        VALUES (new.bbox_x1, new.bbox_x2, new.bbox_y1, new.bbox_y2, new.event_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {BBOX_INDEX_TABLE}_update
+    AFTER UPDATE OF event_id, bbox_x1, bbox_y1, bbox_x2, bbox_y2 ON events BEGIN
+        UPDATE {BBOX_INDEX_TABLE}
+        SET min_x = new.bbox_x1, max_x = new.bbox_x2, min_y = new.bbox_y1, max_y = new.bbox_y2,
+            event_id = new.event_id
+        WHERE {_SQLITE_OLD_BBOX_MATCH};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {BBOX_INDEX_TABLE}_delete AFTER DELETE ON events BEGIN
+        DELETE FROM {BBOX_INDEX_TABLE} WHERE {_SQLITE_OLD_BBOX_MATCH};
+    END""",
+)
+# Repair statements for init_schema. The first drops entries whose event is
+# gone or whose box no longer covers the event's bbox (the R*Tree rounds
+# outwards, so a covering box is still valid); the second indexes events with
+# no entry. Together they catch drift that a row count comparison would miss.
+SQLITE_BBOX_PRUNE = f"""DELETE FROM {BBOX_INDEX_TABLE} WHERE id IN (
+    SELECT b.id FROM {BBOX_INDEX_TABLE} AS b LEFT JOIN events AS e ON e.event_id = b.event_id
+    WHERE e.event_id IS NULL
+        OR NOT (b.min_x <= e.bbox_x1 AND b.max_x >= e.bbox_x2 AND b.min_y <= e.bbox_y1 AND b.max_y >= e.bbox_y2)
+)"""
+SQLITE_BBOX_BACKFILL = f"""INSERT INTO {BBOX_INDEX_TABLE} (min_x, max_x, min_y, max_y, event_id)
+SELECT bbox_x1, bbox_x2, bbox_y1, bbox_y2, event_id FROM events
+WHERE event_id NOT IN (SELECT event_id FROM {BBOX_INDEX_TABLE})"""
+SQLITE_BBOX_OBJECTS = (
+    BBOX_INDEX_TABLE,
+    f'{BBOX_INDEX_TABLE}_insert',
+    f'{BBOX_INDEX_TABLE}_update',
+    f'{BBOX_INDEX_TABLE}_delete',
+)
+POSTGRES_BBOX_INDEX_DDL = (
+    f'CREATE INDEX IF NOT EXISTS {POSTGRES_BBOX_INDEX} ON events '
+    'USING gist (box(point(bbox_x1, bbox_y1), point(bbox_x2, bbox_y2)))'
+)
+
+_initialized_urls = set()
+_bbox_index_ready = set()
+_bbox_index_warned = set()
+
+
+def _create_bbox_index(conn):
+    if conn.dialect.name == 'sqlite':
+        for statement in SQLITE_BBOX_INDEX_DDL:
+            conn.execute(text(statement))
+    elif conn.dialect.name == 'postgresql':
+        conn.execute(text(POSTGRES_BBOX_INDEX_DDL))
+
+
+def build_bbox_index(engine):
+    """Create the spatial index and bring it in line with the events table.
+
+    This scans and may rewrite the whole index while holding the write lock,
+    so it only runs from ``python -m backend.init_schema``, never on startup.
+    """
+    with engine.begin() as conn:
+        _create_bbox_index(conn)
+        if engine.dialect.name == 'sqlite':
+            pruned = conn.execute(text(SQLITE_BBOX_PRUNE)).rowcount
+            added = conn.execute(text(SQLITE_BBOX_BACKFILL)).rowcount
+            logger.info('%s: removed %s stale entries, indexed %s events', BBOX_INDEX_TABLE, pruned, added)
+    _bbox_index_warned.discard(str(engine.url))
+
+
 def init_db(engine):
-    Base.metadata.create_all(bind=engine)
+    """Create missing tables on startup.
+
+    The spatial index is only created here while the events table is empty,
+    where it costs nothing to build; existing databases get it from
+    ``build_bbox_index`` and fall back to table scans until then.
+    """
+    url = str(engine.url)
+    if url in _initialized_urls:
+        return
+    existing = set(inspect(engine).get_table_names())
+    missing = [table for name, table in Base.metadata.tables.items() if name not in existing]
+    if missing:
+        Base.metadata.create_all(bind=engine, tables=missing)
+    if not has_bbox_index(engine, warn=False):
+        with engine.begin() as conn:
+            if conn.scalar(text('SELECT 1 FROM events LIMIT 1')) is None:
+                _create_bbox_index(conn)
+        has_bbox_index(engine)
+    _initialized_urls.add(url)
+
+
+def has_bbox_index(engine, warn: bool = True) -> bool:
+    """Whether the spatial index exists and is maintained. Only a positive result is cached."""
+    url = str(engine.url)
+    if url in _bbox_index_ready:
+        return True
+    with engine.connect() as conn:
+        if engine.dialect.name == 'sqlite':
+            # Without its triggers the R*Tree may be stale, e.g. after a table
+            # rebuild, so it only counts once all of them are present.
+            found = conn.scalar(
+                text('SELECT count(*) FROM sqlite_master WHERE name IN :names').bindparams(
+                    bindparam('names', expanding=True)
+                ),
+                {'names': list(SQLITE_BBOX_OBJECTS)},
+            ) == len(SQLITE_BBOX_OBJECTS)
+        elif engine.dialect.name == 'postgresql':
+            found = conn.scalar(
+                text('SELECT 1 FROM pg_indexes WHERE indexname = :name'),
+                {'name': POSTGRES_BBOX_INDEX},
+            ) is not None
+        else:
+            found = False
+    if found:
+        _bbox_index_ready.add(url)
+    elif warn and url not in _bbox_index_warned:
+        _bbox_index_warned.add(url)
+        logger.warning(
+            'Spatial index on events is missing or incomplete; region filters will scan the table. '
+            'Run `python -m backend.init_schema` to build it.'
+        )
+    return found
+
+
+def bbox_intersects(engine, x1: float, y1: float, x2: float, y2: float) -> list:
+    """Filters selecting events whose bbox intersects the region (x1, y1, x2, y2)."""
+    filters = [
+        Event.bbox_x1 <= x2,
+        Event.bbox_x2 >= x1,
+        Event.bbox_y1 <= y2,
+        Event.bbox_y2 >= y1,
+    ]
+    if engine.dialect.name == 'sqlite' and has_bbox_index(engine):
+        # The R*Tree stores 32-bit floats rounded outwards, so it only narrows
+        # the candidate rows; the exact column checks above still apply.
+        candidates = select(bbox_index.c.event_id).where(
+            bbox_index.c.min_x <= x2,
+            bbox_index.c.max_x >= x1,
+            bbox_index.c.min_y <= y2,
+            bbox_index.c.max_y >= y1,
+        )
+        filters.append(Event.event_id.in_(candidates))
+    elif engine.dialect.name == 'postgresql':
+        has_bbox_index(engine)
+        event_box = func.box(func.point(Event.bbox_x1, Event.bbox_y1), func.point(Event.bbox_x2, Event.bbox_y2))
+        region_box = func.box(func.point(x1, y1), func.point(x2, y2))
+        filters.append(event_box.op('&&')(region_box))
+    return filters
@@ -0,0 +1,59 @@
+"""Measure how long it takes to import the API and run its startup hooks.
+
+Run from the project root:
+
+    python -m backend.profile_startup [--top 15]
+
+Each measurement runs in a fresh interpreter so module caches from previous
+runs do not hide import cost. The slowest imports are read from Python's
+``-X importtime`` output.
+"""
+import argparse
+import subprocess
+import sys
+
+IMPORT_SNIPPET = 'import backend.app'
+STARTUP_SNIPPET = (
+    'import asyncio, time\n'
+    'start = time.perf_counter()\n'
+    'import backend.app as app_module\n'
+    'imported = time.perf_counter()\n'
+    'for handler in app_module.app.router.on_startup:\n'
+    '    asyncio.run(handler())\n'
+    'ready = time.perf_counter()\n'
+    "print(f'import: {(imported - start) * 1000:.1f} ms')\n"
+    "print(f'startup hooks: {(ready - imported) * 1000:.1f} ms')\n"
+    "print(f'total: {(ready - start) * 1000:.1f} ms')\n"
+)
+
+
+def slowest_imports(top: int):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', IMPORT_SNIPPET],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+        timings.append((int(cumulative_us), int(self_us), module.strip()))
+    timings.sort(reverse=True)
+    return timings[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=15, help='number of slowest imports to list')
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, '-c', STARTUP_SNIPPET], check=True)
+    print('\nslowest imports (cumulative):')
+    for cumulative_us, self_us, module in slowest_imports(args.top):
+        print(f'{cumulative_us / 1000:8.1f} ms  {self_us / 1000:8.1f} ms self  {module}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import gzip
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024
+
+
+def _accepted_encodings(header: str) -> dict:
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the supported coding with the highest q value, or None for identity.
+
+    Ties go to the first supported coding (brotli, then gzip). Identity only
+    wins when the client rates it strictly higher than every coding.
+    """
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get('*', 0.0)
+    supported = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    best, best_q = None, 0.0
+    for coding in supported:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_q:
+            best, best_q = coding, quality
+
+    # An unlisted identity is only the fallback; it competes on q when the
+    # client rates it explicitly or through "*".
+    identity_q = accepted.get('identity', wildcard)
+    if best is None or identity_q > best_q:
+        return None
+    return best
+
+
+def json_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    response = ORJSONResponse(content, status_code=status_code)
+    response.headers['Vary'] = 'Accept-Encoding'
+    if len(response.body) < MIN_COMPRESS_SIZE:
+        return response
+
+    encoding = negotiate_encoding(request.headers.get('accept-encoding', ''))
+    if encoding == 'br':
+        body = brotli.compress(response.body, quality=4)
+    elif encoding == 'gzip':
+        body = gzip.compress(response.body, compresslevel=5)
+    else:
+        return response
+
+    response.body = body
+    response.headers['Content-Encoding'] = encoding
+    response.headers['Content-Length'] = str(len(body))
+    return response
@@ -20,6 +20,8 @@ class Settings(BaseSettings):
     s3_endpoint_url: Optional[str] = None
     s3_presign_expiry_seconds: int = 3600
     enable_cors_origins: Optional[str] = None
+    enable_rate_limit: bool = True
+    auto_create_schema: bool = True
     media_token_secret: str
 
     class Config:
@@ -1,8 +1,7 @@
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-import boto3
-from botocore.client import Config
 from fastapi import UploadFile
 
 from .settings import settings
@@ -31,7 +30,11 @@ def chunk_path(session_id: str, started_at: datetime, index: int) -> Path:
     return path / f'{time_part}_{index}.webm'
 
 
+@lru_cache(maxsize=1)
 def get_s3_client():
+    import boto3
+    from botocore.client import Config
+
     session = boto3.session.Session()
     return session.client(
         's3',
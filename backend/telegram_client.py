@@ -1,11 +1,11 @@
 from typing import Optional
 
-import httpx
-
 from .settings import settings
 
 
 async def send_photo(photo_path: str, caption: str) -> Optional[int]:
+    import httpx
+
     url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/sendPhoto"
     async with httpx.AsyncClient(timeout=10) as client:
         with open(photo_path, 'rb') as file:
@@ -50,7 +50,7 @@ def app_context(tmp_path_factory):
     storage_module.STORAGE_ROOT = Path(storage_dir)
     app_module.STORAGE_ROOT = Path(storage_dir)
     storage_module.ensure_storage()
-    models_module.init_db(database_module.engine)
+    models_module.init_db(database_module.get_engine())
 
     return {
         'package': backend_pkg,
@@ -76,7 +76,7 @@ def storage_dir(app_context):
 
 @pytest.fixture
 def db_session(app_context):
-    session = app_context['database_module'].SessionLocal()
+    session = app_context['database_module'].get_sessionmaker()()
     try:
         yield session
     finally:
@@ -2,9 +2,37 @@ import io
 import json
 from datetime import datetime, timezone
 
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
 API_KEY_HEADER = {'X-API-Key': 'test-key'}
 
 
+def make_event(event_id, bbox=(0.0, 0.0, 1.0, 1.0), avg_conf=0.8, duration_ms=1500, **overrides):
+    from backend.models import Event
+
+    fields = {
+        'event_id': event_id,
+        'ts': '2024-01-01T12:00:00+00:00',
+        'company_key': 'acme',
+        'track_id': 'track',
+        'bbox_x1': bbox[0],
+        'bbox_y1': bbox[1],
+        'bbox_x2': bbox[2],
+        'bbox_y2': bbox[3],
+        'avg_conf': avg_conf,
+        'duration_ms': duration_ms,
+        'clip_enabled': 0,
+        'clip_score': None,
+        'snapshot_path': f'snapshots/2024/01/01/{event_id}.jpg',
+        'video_ref': None,
+        'telegram_message_id': None,
+        'created_at': '2024-01-01T12:00:01+00:00',
+    }
+    fields.update(overrides)
+    return Event(**fields)
+
+
 def test_event_ingest_stores_snapshot_and_row(client, storage_dir, db_session, monkeypatch):
     from backend.models import Event
 
@@ -46,6 +74,7 @@ def test_event_ingest_stores_snapshot_and_row(client, storage_dir, db_session, m
     event = events[0]
     assert event.company_key == 'acme'
     assert event.telegram_message_id == 123
+    assert bbox_index_rows(db_session) == [(event.event_id, 0, 0, 10, 10)]
 
 
 def test_upload_chunk_stores_file(client, storage_dir):
@@ -91,25 +120,12 @@ def test_missing_api_key_rejected(client):
 
 
 def test_events_list_returns_data(client, db_session):
-    from backend.models import Event
-
-    event = Event(
-        event_id='event-1',
-        ts='2024-01-01T12:00:00+00:00',
-        company_key='acme',
-        track_id='track',
-        bbox_x1=0.0,
-        bbox_y1=0.0,
-        bbox_x2=1.0,
-        bbox_y2=1.0,
-        avg_conf=0.8,
-        duration_ms=1500,
+    event = make_event(
+        'event-1',
         clip_enabled=1,
         clip_score=0.5,
-        snapshot_path='snapshots/2024/01/01/event-1.jpg',
         video_ref='chunks/2024/01/01/session/120000_0.webm',
         telegram_message_id=111,
-        created_at='2024-01-01T12:00:01+00:00',
     )
     db_session.add(event)
     db_session.commit()
@@ -119,3 +135,119 @@ def test_events_list_returns_data(client, db_session):
     body = resp.json()
     assert body['total'] == 1
     assert body['items'][0]['event_id'] == 'event-1'
+    assert body['items'][0]['ts'] == '2024-01-01T12:00:00Z'
+
+
+def test_events_list_compresses_large_pages(client, db_session):
+    for index in range(40):
+        db_session.add(make_event(f'event-{index}', ts=f'2024-01-01T12:00:{index:02d}+00:00'))
+    db_session.commit()
+
+    resp = client.get('/events', headers={**API_KEY_HEADER, 'Accept-Encoding': 'gzip'})
+    assert resp.status_code == 200
+    assert resp.headers['content-encoding'] == 'gzip'
+    body = resp.json()
+    assert body['total'] == 40
+    assert body['items'][0]['event_id'] == 'event-39'
+    assert body['items'][0]['clip_enabled'] is False
+
+
+def test_events_list_filters_by_region_conf_and_duration(client, db_session):
+    db_session.add_all(
+        [
+            make_event('inside', (100, 100, 200, 200), 0.9, 4000),
+            make_event('outside', (500, 500, 600, 600), 0.9, 4000),
+            make_event('low-conf', (120, 120, 180, 180), 0.5, 4000),
+            make_event('short', (150, 150, 250, 250), 0.9, 1000),
+        ]
+    )
+    db_session.commit()
+
+    params = {'region': '0,0,160,160', 'min_conf': 0.7, 'min_duration_ms': 3000}
+    resp = client.get('/events', headers=API_KEY_HEADER, params=params)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['total'] == 1
+    assert [item['event_id'] for item in body['items']] == ['inside']
+
+    resp = client.get('/events', headers=API_KEY_HEADER, params={'region': '0,0,160'})
+    assert resp.status_code == 400
+
+
+def bbox_index_rows(db_session):
+    rows = db_session.execute(text('SELECT event_id, min_x, min_y, max_x, max_y FROM events_bbox ORDER BY event_id'))
+    return [tuple(row) for row in rows]
+
+
+def test_bbox_index_follows_inserts_updates_and_deletes(db_session):
+    from backend.models import Event
+
+    db_session.add_all([make_event('a', (10, 20, 30, 40), 0.9, 4000), make_event('b', (50, 50, 60, 60), 0.9, 4000)])
+    db_session.commit()
+    assert bbox_index_rows(db_session) == [('a', 10, 20, 30, 40), ('b', 50, 50, 60, 60)]
+
+    event = db_session.get(Event, 'a')
+    event.bbox_x1 = 15.0
+    event.bbox_y2 = 45.0
+    db_session.commit()
+    assert bbox_index_rows(db_session) == [('a', 15, 20, 30, 45), ('b', 50, 50, 60, 60)]
+
+    db_session.delete(event)
+    db_session.commit()
+    assert bbox_index_rows(db_session) == [('b', 50, 50, 60, 60)]
+
+
+def test_bbox_intersects_queries_rtree_on_sqlite(app_context, db_session):
+    from backend.models import Event, bbox_intersects
+
+    engine = app_context['database_module'].get_engine()
+    stmt = select(Event.event_id).where(*bbox_intersects(engine, 0, 0, 100, 100))
+    sql = str(stmt.compile(engine, compile_kwargs={'literal_binds': True}))
+    assert 'events_bbox' in sql
+
+    plan = db_session.execute(text(f'EXPLAIN QUERY PLAN {sql}')).all()
+    assert any('events_bbox VIRTUAL TABLE' in row[-1] for row in plan)
+
+
+def test_build_bbox_index_repairs_drift_with_equal_counts(app_context, tmp_path):
+    models_module = app_context['models_module']
+    engine = create_engine(f'sqlite:///{tmp_path / "drift.db"}')
+    models_module.init_db(engine)
+    assert models_module.has_bbox_index(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        session.add_all([make_event('a', (0, 0, 10, 10)), make_event('b', (20, 20, 30, 30))])
+        session.commit()
+
+        # Simulate a table rebuild that dropped the triggers, followed by writes
+        # that leave both tables with the same number of rows.
+        for name in models_module.SQLITE_BBOX_OBJECTS[1:]:
+            session.execute(text(f'DROP TRIGGER {name}'))
+        session.execute(text("DELETE FROM events WHERE event_id = 'a'"))
+        session.execute(text("UPDATE events SET bbox_x1 = 40, bbox_x2 = 50 WHERE event_id = 'b'"))
+        session.add(make_event('c', (60, 60, 70, 70)))
+        session.commit()
+
+    models_module._bbox_index_ready.discard(str(engine.url))
+    assert not models_module.has_bbox_index(engine)
+
+    models_module.build_bbox_index(engine)
+    assert models_module.has_bbox_index(engine)
+    with Session() as session:
+        assert bbox_index_rows(session) == [('b', 40, 20, 50, 30), ('c', 60, 60, 70, 70)]
+    engine.dispose()
+
+
+def test_negotiate_encoding_prefers_highest_quality(monkeypatch):
+    from backend import responses
+
+    monkeypatch.setattr(responses, 'brotli', object())
+    assert responses.negotiate_encoding('gzip, br') == 'br'
+    assert responses.negotiate_encoding('gzip;q=1, br;q=0.1') == 'gzip'
+    assert responses.negotiate_encoding('br;q=0, *') == 'gzip'
+    assert responses.negotiate_encoding('identity;q=1, gzip;q=0.5') is None
+    assert responses.negotiate_encoding('*;q=0, identity') is None
+    assert responses.negotiate_encoding('') is None
+
+    monkeypatch.setattr(responses, 'brotli', None)
+    assert responses.negotiate_encoding('br, gzip;q=0.5') == 'gzip'
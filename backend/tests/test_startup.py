@@ -0,0 +1,115 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, text
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def run_import_check(tmp_path, code: str, **overrides):
+    env = {
+        **os.environ,
+        'API_KEY': 'test-key',
+        'TELEGRAM_BOT_TOKEN': 'token',
+        'TELEGRAM_CHAT_ID': 'chat',
+        'MEDIA_TOKEN_SECRET': 'secret',
+        'DATABASE_URL': f'sqlite:///{tmp_path / "events.db"}',
+        'ENABLE_S3': 'false',
+        **overrides,
+    }
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_app_import_skips_boto3_when_s3_disabled(tmp_path):
+    run_import_check(
+        tmp_path,
+        'import sys\n'
+        'import backend.app\n'
+        "loaded = [name for name in sys.modules if name.split('.')[0] in ('boto3', 'botocore')]\n"
+        'assert not loaded, loaded\n',
+    )
+
+
+def test_rate_limit_disabled_uses_noop_limiter(tmp_path):
+    run_import_check(
+        tmp_path,
+        'import sys\n'
+        'import backend.app as app_module\n'
+        "assert type(app_module.limiter).__name__ == '_NoopLimiter'\n"
+        "loaded = [name for name in sys.modules if name.split('.')[0] == 'slowapi']\n"
+        'assert not loaded, loaded\n',
+        ENABLE_RATE_LIMIT='false',
+    )
+
+
+def test_init_db_second_call_issues_no_ddl(app_context, tmp_path):
+    models_module = app_context['models_module']
+    engine = create_engine(f'sqlite:///{tmp_path / "init.db"}')
+    models_module.init_db(engine)
+
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda conn, cursor, statement, *args: statements.append(statement))
+    models_module.init_db(engine)
+    assert statements == []
+    engine.dispose()
+
+
+def test_workers_start_without_backfilling_populated_database(app_context, tmp_path):
+    models_module = app_context['models_module']
+    db_path = tmp_path / 'populated.db'
+    engine = create_engine(f'sqlite:///{db_path}')
+    models_module.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            models_module.Event.__table__.insert(),
+            [
+                {
+                    'event_id': f'event-{index}',
+                    'ts': '2024-01-01T12:00:00+00:00',
+                    'company_key': 'acme',
+                    'track_id': 'track',
+                    'bbox_x1': 0.0,
+                    'bbox_y1': 0.0,
+                    'bbox_x2': 1.0,
+                    'bbox_y2': 1.0,
+                    'avg_conf': 0.8,
+                    'duration_ms': 1500,
+                    'clip_enabled': 0,
+                    'snapshot_path': f'snapshots/event-{index}.jpg',
+                    'created_at': '2024-01-01T12:00:01+00:00',
+                }
+                for index in range(20000)
+            ],
+        )
+
+    worker = (
+        'from sqlalchemy import create_engine\n'
+        'from backend.models import has_bbox_index, init_db\n'
+        f"engine = create_engine('sqlite:///{db_path}')\n"
+        'init_db(engine)\n'
+        'assert not has_bbox_index(engine)\n'
+    )
+    workers = [
+        subprocess.Popen([sys.executable, '-c', worker], cwd=PROJECT_ROOT, stderr=subprocess.PIPE, text=True)
+        for _ in range(2)
+    ]
+    for process in workers:
+        _, stderr = process.communicate(timeout=60)
+        assert process.returncode == 0, stderr
+        assert 'missing or incomplete' in stderr
+
+    assert not models_module.has_bbox_index(engine)
+    models_module.build_bbox_index(engine)
+    assert models_module.has_bbox_index(engine)
+    with engine.connect() as conn:
+        assert conn.scalar(text('SELECT count(*) FROM events_bbox')) == 20000
+    engine.dispose()
@@ -133,6 +133,9 @@ export interface EventListFilters {
   to?: string;
   company_key?: string;
   clip_enabled?: boolean;
+  min_conf?: number;
+  min_duration_ms?: number;
+  region?: [number, number, number, number];
 }
 
 export async function fetchEvents(filters: EventListFilters): Promise<EventListResponse> {
@@ -143,6 +146,9 @@ export async function fetchEvents(filters: EventListFilters): Promise<EventListR
   if (filters.to) params.append('to_ts', filters.to);
   if (filters.company_key) params.append('company_key', filters.company_key);
   if (typeof filters.clip_enabled === 'boolean') params.append('clip_enabled', String(filters.clip_enabled));
+  if (typeof filters.min_conf === 'number') params.append('min_conf', String(filters.min_conf));
+  if (typeof filters.min_duration_ms === 'number') params.append('min_duration_ms', String(filters.min_duration_ms));
+  if (filters.region) params.append('region', filters.region.join(','));
 
   const res = await fetch(`${API_BASE}/events?${params.toString()}`, {
     headers: {